@@ -1,15 +1,17 @@
 import re
 from dataclasses import dataclass
-from typing import Optional
-from urllib.parse import parse_qs, urlparse
+from functools import lru_cache
+from typing import Dict, Optional
+from urllib.parse import parse_qsl, unquote_plus
 
-from .normalize_url import normalize_unknown_url
+from .normalize_url import cached_urlparse, normalize_unknown_url
 
 
 CAFE24_DETAIL_RE = re.compile(r"/product/detail\.html", re.IGNORECASE)
 SHOPIFY_PRODUCT_RE = re.compile(r"/products/([^/?#]+)", re.IGNORECASE)
 CUSTOM_PHP_RE = re.compile(r"/detail\.php", re.IGNORECASE)
-CUSTOM_PHP_ID_RE = re.compile(r"(?:^|&|\?)(pno|goodsno|product_no)=([^&]+)", re.IGNORECASE)
+PRODUCT_ID_PARAM_RE = re.compile(r"(?:^|&)(pno|goodsno|product_no)=([^&]+)")
+CUSTOM_PHP_ID_KEYS = ("pno", "goodsno", "product_no")
 
 
 @dataclass(frozen=True)
@@ -19,6 +21,7 @@ class CanonicalizationResult:
     platform_hint: str
 
 
+@lru_cache(maxsize=65536)
 def canonicalize_url(url: str, platform_hint: str) -> CanonicalizationResult:
     if platform_hint == "auto":
         detected = detect_platform(url)
@@ -39,17 +42,19 @@ def canonicalize_url(url: str, platform_hint: str) -> CanonicalizationResult:
     return CanonicalizationResult(normalize_unknown_url(url), None, "unknown")
 
 
+@lru_cache(maxsize=65536)
 def detect_platform(url: str) -> str:
-    parsed = urlparse(url)
-    path = parsed.path or ""
-    query = parsed.query or ""
+    head, _, query = url.partition("#")[0].partition("?")
+    head_lower = head.lower()
 
-    if CAFE24_DETAIL_RE.search(path) and "product_no=" in query:
+    if "/product/detail.html" in head_lower and "product_no=" in query:
         return "cafe24"
-    if SHOPIFY_PRODUCT_RE.search(path):
+    if "/products/" in head_lower and SHOPIFY_PRODUCT_RE.search(head):
         return "shopify"
-    if CUSTOM_PHP_RE.search(path) and CUSTOM_PHP_ID_RE.search(query):
-        return "custom_php"
+    if "/detail.php" in head_lower:
+        params = "&" + query.lower()
+        if "&pno=" in params or "&goodsno=" in params or "&product_no=" in params:
+            return "custom_php"
     return "unknown"
 
 
@@ -66,13 +71,12 @@ def canonicalize_by_platform(url: str, platform_hint: str) -> Optional[Canonical
 
 
 def canonicalize_cafe24(url: str) -> Optional[CanonicalizationResult]:
-    parsed = urlparse(url)
+    parsed = cached_urlparse(url)
     if not parsed.scheme or not parsed.netloc:
         return None
     if not CAFE24_DETAIL_RE.search(parsed.path or ""):
         return None
-    query = parse_qs(parsed.query)
-    product_no = _first_value(query.get("product_no"))
+    product_no = _product_id_params(parsed.query).get("product_no")
     if not product_no:
         return None
     canonical = f"{parsed.scheme}://{parsed.netloc}/product/detail.html?product_no={product_no}"
@@ -80,7 +84,7 @@ def canonicalize_cafe24(url: str) -> Optional[CanonicalizationResult]:
 
 
 def canonicalize_shopify(url: str) -> Optional[CanonicalizationResult]:
-    parsed = urlparse(url)
+    parsed = cached_urlparse(url)
     if not parsed.scheme or not parsed.netloc:
         return None
     match = SHOPIFY_PRODUCT_RE.search(parsed.path or "")
@@ -92,22 +96,26 @@ def canonicalize_shopify(url: str) -> Optional[CanonicalizationResult]:
 
 
 def canonicalize_custom_php(url: str) -> Optional[CanonicalizationResult]:
-    parsed = urlparse(url)
+    parsed = cached_urlparse(url)
     if not parsed.scheme or not parsed.netloc:
         return None
     if not CUSTOM_PHP_RE.search(parsed.path or ""):
         return None
-    query = parse_qs(parsed.query)
-    for key in ("pno", "goodsno", "product_no"):
-        value = _first_value(query.get(key))
+    values = _product_id_params(parsed.query)
+    for key in CUSTOM_PHP_ID_KEYS:
+        value = values.get(key)
         if value:
             canonical = f"{parsed.scheme}://{parsed.netloc}{parsed.path}?{key}={value}"
             return CanonicalizationResult(canonical, value, "custom_php")
     return None
 
 
-def _first_value(values: Optional[list]) -> Optional[str]:
-    if not values:
-        return None
-    value = values[0]
-    return value if value else None
+def _product_id_params(query: str) -> Dict[str, str]:
+    if "%" in query:
+        pairs = parse_qsl(query)
+    else:
+        pairs = [(key, unquote_plus(value)) for key, value in PRODUCT_ID_PARAM_RE.findall(query)]
+    values: Dict[str, str] = {}
+    for key, value in pairs:
+        values.setdefault(key, value)
+    return values
@@ -1,16 +1,18 @@
 import re
 from dataclasses import dataclass
-from typing import Iterable, List, Optional
-from urllib.parse import parse_qs, urljoin, urlparse, urlunparse
+from typing import Iterable, List, Optional, Tuple
+from urllib.parse import ParseResult, urlunparse
 
-from bs4 import BeautifulSoup
+from lxml import etree
+from lxml.html import HtmlElement
 
-from .extract_links import _is_skippable_href, classify_product_url
+from .extract_links import _LOWER, _UPPER, _is_skippable_href, _join_url, classify_product_parts
+from .normalize_url import cached_urlparse
 
 
 BREADCRUMB_HINTS = ("breadcrumb", "bread", "path", "location")
 CATEGORY_CONTAINER_HINTS = ("category", "cate", "sub", "tabs", "tab", "menu", "lnb", "gnb")
-ACTIVE_CLASS_HINTS = {"active", "on", "selected", "current"}
+ACTIVE_CLASS_HINTS = frozenset({"active", "on", "selected", "current"})
 ARIA_CURRENT_HINTS = {"page", "true"}
 ARIA_SELECTED_HINTS = {"true", "1"}
 CATEGORY_QUERY_KEYS = {
@@ -32,6 +34,31 @@ CATEGORY_PATH_HINTS = (
     "/list",
     "/shop",
 )
+CATEGORY_QUERY_RE = re.compile(
+    r"(?:^|&)(?:" + "|".join(sorted(map(re.escape, CATEGORY_QUERY_KEYS))) + r")=[^&]"
+)
+CATEGORY_PATH_RE = re.compile("|".join(map(re.escape, CATEGORY_PATH_HINTS)), re.IGNORECASE)
+
+
+def _hint_conditions(hints: Iterable[str]) -> List[str]:
+    conditions = []
+    for hint in hints:
+        for attr in ("@class", "@id"):
+            conditions.append(f"contains(translate({attr}, '{_UPPER}', '{_LOWER}'), '{hint}')")
+    return conditions
+
+
+_BREADCRUMB_XPATH = etree.XPath(
+    "//*[{}]".format(
+        " or ".join(
+            [f"contains(translate(@aria-label, '{_UPPER}', '{_LOWER}'), 'breadcrumb')"]
+            + _hint_conditions(BREADCRUMB_HINTS)
+        )
+    )
+)
+_CATEGORY_CONTAINER_XPATH = etree.XPath(
+    "//*[{}]".format(" or ".join(_hint_conditions(CATEGORY_CONTAINER_HINTS)))
+)
 
 
 @dataclass(frozen=True)
@@ -40,15 +67,8 @@ class CategoryLink:
     label: str
 
 
-def extract_breadcrumbs(soup: BeautifulSoup) -> List[str]:
-    containers = []
-
-    for node in soup.find_all(attrs={"aria-label": True}):
-        aria = (node.get("aria-label") or "").lower()
-        if "breadcrumb" in aria:
-            containers.append(node)
-
-    containers.extend(_find_by_hint(soup, BREADCRUMB_HINTS))
+def extract_breadcrumbs(tree: HtmlElement) -> List[str]:
+    containers = _BREADCRUMB_XPATH(tree)
 
     best: List[str] = []
     for container in containers:
@@ -61,101 +81,59 @@ def extract_breadcrumbs(soup: BeautifulSoup) -> List[str]:
     return _dedupe_preserve_order(cleaned)
 
 
-def extract_subcategory_links(soup: BeautifulSoup, base_url: str) -> List[CategoryLink]:
-    containers = _find_by_hint(soup, CATEGORY_CONTAINER_HINTS)
+def extract_category_info(
+    tree: HtmlElement,
+    base_url: str,
+) -> Tuple[List[CategoryLink], Optional[str]]:
+    containers = _CATEGORY_CONTAINER_XPATH(tree)
     if not containers:
-        containers = [soup]
+        containers = [tree]
 
-    base_host = urlparse(base_url).netloc.lower()
+    base_host = cached_urlparse(base_url).netloc.lower()
     candidates: List[CategoryLink] = []
+    active_label: Optional[str] = None
     seen = set()
 
     for container in containers:
-        for anchor in container.find_all("a", href=True):
+        for anchor in container.iterdescendants("a"):
             href = anchor.get("href")
             if not href:
                 continue
             href = href.strip()
             if _is_skippable_href(href):
                 continue
-            label = _clean_text(anchor.get_text(" ", strip=True))
+            label = _clean_text(" ".join(anchor.itertext()))
             if not label:
                 continue
 
-            absolute = urljoin(base_url, href)
-            parsed = urlparse(absolute)
+            absolute = _join_url(base_url, href)
+            parsed = cached_urlparse(absolute)
             if parsed.netloc.lower() != base_host:
                 continue
-            if classify_product_url(absolute) is not None:
+            if classify_product_parts(parsed.path, parsed.query) is not None:
                 continue
-            if not _looks_like_category_url(absolute):
+            if not _looks_like_category_url(parsed):
                 continue
 
-            normalized = _strip_fragment(absolute)
+            if active_label is None and _is_active_anchor(anchor):
+                active_label = label
+
+            normalized = _strip_fragment(parsed)
             if normalized in seen:
                 continue
             seen.add(normalized)
             candidates.append(CategoryLink(url=normalized, label=label))
 
-    return candidates
+    return candidates, active_label
 
 
-def detect_active_subcategory_label(soup: BeautifulSoup, base_url: str) -> Optional[str]:
-    containers = _find_by_hint(soup, CATEGORY_CONTAINER_HINTS)
-    if not containers:
-        containers = [soup]
-
-    base_host = urlparse(base_url).netloc.lower()
-
-    for container in containers:
-        for anchor in container.find_all("a", href=True):
-            href = anchor.get("href")
-            if not href:
-                continue
-            href = href.strip()
-            if _is_skippable_href(href):
-                continue
-
-            label = _clean_text(anchor.get_text(" ", strip=True))
-            if not label:
-                continue
-
-            absolute = urljoin(base_url, href)
-            parsed = urlparse(absolute)
-            if parsed.netloc.lower() != base_host:
-                continue
-            if classify_product_url(absolute) is not None:
-                continue
-            if not _looks_like_category_url(absolute):
-                continue
-
-            if _is_active_anchor(anchor):
-                return label
-
-    return None
-
-
-def _looks_like_category_url(url: str) -> bool:
-    parsed = urlparse(url)
-    path = (parsed.path or "").lower()
-    query = parse_qs(parsed.query)
-
-    if any(key in query for key in CATEGORY_QUERY_KEYS):
+def _looks_like_category_url(parsed: ParseResult) -> bool:
+    if CATEGORY_QUERY_RE.search(parsed.query):
         return True
-    return any(hint in path for hint in CATEGORY_PATH_HINTS)
-
-
-def _find_by_hint(soup: BeautifulSoup, hints: Iterable[str]) -> List[BeautifulSoup]:
-    hits = []
-    for node in soup.find_all(True):
-        classes = " ".join(node.get("class", [])).lower()
-        node_id = (node.get("id") or "").lower()
-        if any(hint in classes or hint in node_id for hint in hints):
-            hits.append(node)
-    return hits
+    return CATEGORY_PATH_RE.search(parsed.path) is not None
 
 
-def _is_active_anchor(anchor: BeautifulSoup) -> bool:
+def _is_active_anchor(anchor: HtmlElement) -> bool:
     aria_current = (anchor.get("aria-current") or "").lower()
     if aria_current in ARIA_CURRENT_HINTS:
         return True
@@ -166,35 +144,35 @@ def _is_active_anchor(anchor: BeautifulSoup) -> bool:
 
     if _has_active_class(anchor):
         return True
-    if anchor.parent and _has_active_class(anchor.parent):
-        return True
-    if anchor.parent and anchor.parent.parent and _has_active_class(anchor.parent.parent):
+    parent = anchor.getparent()
+    if parent is not None and _has_active_class(parent):
         return True
+    if parent is not None:
+        grandparent = parent.getparent()
+        if grandparent is not None and _has_active_class(grandparent):
+            return True
 
     return False
 
 
-def _has_active_class(node: BeautifulSoup) -> bool:
-    classes = node.get("class", [])
-    for name in classes:
-        if name.lower() in ACTIVE_CLASS_HINTS:
-            return True
-    return False
+def _has_active_class(node: HtmlElement) -> bool:
+    classes = node.get("class")
+    if not classes:
+        return False
+    return not ACTIVE_CLASS_HINTS.isdisjoint(classes.lower().split())
 
 
-def _extract_text_nodes(container: BeautifulSoup) -> List[str]:
+def _extract_text_nodes(container: HtmlElement) -> List[str]:
     labels: List[str] = []
-    for node in container.find_all(["a", "span", "li"]):
-        text = node.get_text(" ", strip=True)
+    for node in container.iterdescendants("a", "span", "li"):
+        text = " ".join(node.itertext()).strip()
         if text:
             labels.append(text)
     return labels
 
 
 def _clean_text(text: str) -> str:
-    cleaned = re.sub(r"\\s+", " ", text or "").strip()
-    cleaned = cleaned.strip(">/|")
-    return cleaned
+    return " ".join((text or "").split()).strip(">/|")
 
 
 def _dedupe_preserve_order(items: List[str]) -> List[str]:
@@ -208,6 +186,5 @@ def _dedupe_preserve_order(items: List[str]) -> List[str]:
     return output
 
 
-def _strip_fragment(url: str) -> str:
-    parsed = urlparse(url)
+def _strip_fragment(parsed: ParseResult) -> str:
     return urlunparse(parsed._replace(fragment=""))
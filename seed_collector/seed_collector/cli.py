@@ -1,32 +1,37 @@
 import argparse
 import asyncio
-import json
 import logging
 import sys
 import uuid
+from collections import OrderedDict
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
 
-from bs4 import BeautifulSoup
+import msgspec
+from lxml.html import HtmlElement
 
 from .canonicalize import canonicalize_url
-from .category_parser import (
-    detect_active_subcategory_label,
-    extract_breadcrumbs,
-    extract_subcategory_links,
+from .category_parser import extract_breadcrumbs, extract_category_info
+from .extract_links import (
+    FAST_PATH_PLATFORMS,
+    LinkCandidate,
+    extract_next_link_from_tree,
+    extract_product_links_from_tree,
+    fast_extract_product_links,
+    parse_html,
 )
-from .extract_links import extract_next_link_from_soup, extract_product_links_from_soup
 from .fetcher import FetchError, Fetcher
 from .jsonl_writer import JsonlWriter
 from .models import SeedDetailUrl, SeedFailure, SeedManifest
-from .normalize_url import build_page_url, get_shop_base_url
-from .robots import check_robots
+from .normalize_url import build_page_url, cached_urlparse, get_shop_base_url
+from .robots import RobotsCache
 
 
 DEFAULT_USER_AGENT = "seed-collector/0.1"
+MAX_VISITED_PAGES = 10000
 
 
 @dataclass
@@ -80,6 +85,11 @@ def build_parser() -> argparse.ArgumentParser:
         default="auto",
         help="Subcategory discovery: auto, off, or expand",
     )
+    collect.add_argument(
+        "--fast-extract",
+        action="store_true",
+        help="Match shopify/custom_php detail links in raw HTML (page_param only; no anchor_text)",
+    )
 
     return parser
 
@@ -111,6 +121,7 @@ async def collect(args: argparse.Namespace) -> None:
     failure_writer = JsonlWriter(failure_path)
 
     state_lock = asyncio.Lock()
+    robots_cache = RobotsCache()
     stop_event = asyncio.Event()
 
     seen_canonical = set()
@@ -119,6 +130,11 @@ async def collect(args: argparse.Namespace) -> None:
     failures_count = 0
 
     max_products = args.max_products if args.max_products > 0 else None
+    use_fast_path = (
+        args.fast_extract
+        and args.paging_mode == "page_param"
+        and args.platform_hint in FAST_PATH_PLATFORMS
+    )
     max_pages = args.max_pages_per_category if args.max_pages_per_category > 0 else None
 
     async def record_failure(
@@ -141,7 +157,7 @@ async def collect(args: argparse.Namespace) -> None:
             created_at=_now_iso(),
         )
         async with state_lock:
-            failure_writer.write(record.model_dump())
+            failure_writer.write(record)
             failures_count += 1
 
     async def increment_list_pages() -> None:
@@ -149,50 +165,25 @@ async def collect(args: argparse.Namespace) -> None:
         async with state_lock:
             total_list_pages_fetched += 1
 
-    async def record_detail(
-        candidate_url: str,
-        canonical_url: str,
-        platform_hint: str,
-        external_product_id: Optional[str],
-        anchor_text: Optional[str],
-        list_page_url: str,
-        input_category_url: str,
-        category_target_url: str,
-        category_path: List[str],
-        category_leaf: Optional[str],
-        status_code: int,
-    ) -> None:
+    async def record_details(records: List[Optional[SeedDetailUrl]]) -> None:
         nonlocal total_detail_urls
-
-        record = SeedDetailUrl(
-            seed_run_id=seed_run_id,
-            shop_base_url=get_shop_base_url(canonical_url),
-            platform_hint=platform_hint,
-            category_url=input_category_url,
-            category_target_url=category_target_url,
-            category_path=category_path,
-            category_leaf=category_leaf,
-            list_page_url=list_page_url,
-            discovered_at=_now_iso(),
-            detail_url=candidate_url,
-            canonical_url=canonical_url,
-            external_product_id=external_product_id,
-            anchor_text=anchor_text,
-            http_status=status_code,
-            notes=[],
-        )
+        if not records:
+            return
 
         async with state_lock:
-            total_detail_urls += 1
-            if canonical_url in seen_canonical:
-                return
-            if max_products is not None and len(seen_canonical) >= max_products:
-                stop_event.set()
-                return
-            seen_canonical.add(canonical_url)
-            detail_writer.write(record.model_dump())
-            if max_products is not None and len(seen_canonical) >= max_products:
-                stop_event.set()
+            for record in records:
+                if stop_event.is_set():
+                    break
+                total_detail_urls += 1
+                if record is None or record.canonical_url in seen_canonical:
+                    continue
+                if max_products is not None and len(seen_canonical) >= max_products:
+                    stop_event.set()
+                    break
+                seen_canonical.add(record.canonical_url)
+                detail_writer.write(record)
+                if max_products is not None and len(seen_canonical) >= max_products:
+                    stop_event.set()
 
     async def fetch_page(
         input_category_url: str,
@@ -238,7 +229,13 @@ async def collect(args: argparse.Namespace) -> None:
             return None
 
         try:
-            soup = BeautifulSoup(response.text, "html.parser")
+            candidates, next_link = await asyncio.to_thread(
+                _parse_page,
+                response.text,
+                list_page_url,
+                args.platform_hint,
+                use_fast_path,
+            )
         except Exception as exc:
             await record_failure(
                 input_category_url,
@@ -250,9 +247,6 @@ async def collect(args: argparse.Namespace) -> None:
             )
             return None
 
-        candidates = extract_product_links_from_soup(soup, list_page_url, args.platform_hint)
-        next_link = extract_next_link_from_soup(soup, list_page_url)
-
         if not candidates:
             await record_failure(
                 input_category_url,
@@ -270,39 +264,53 @@ async def collect(args: argparse.Namespace) -> None:
         context: CategoryContext,
         list_page_url: str,
         category_seen: set,
+        category_raw_seen: set,
     ) -> int:
         page_new = 0
+        records: List[Optional[SeedDetailUrl]] = []
         list_cate_no = _get_query_value(list_page_url, "cate_no")
         for candidate in page_result.candidates:
             if stop_event.is_set():
                 break
+            if candidate.url in category_raw_seen:
+                records.append(None)
+                continue
             result = canonicalize_url(candidate.url, args.platform_hint)
             if result.platform_hint == "cafe24" and list_cate_no:
                 candidate_cate_no = _get_query_value(candidate.url, "cate_no")
                 if candidate_cate_no and candidate_cate_no != list_cate_no:
                     continue
+            category_raw_seen.add(candidate.url)
             canonical_url = result.canonical_url
             if canonical_url not in category_seen:
                 category_seen.add(canonical_url)
                 page_new += 1
-            await record_detail(
-                candidate.url,
-                canonical_url,
-                result.platform_hint,
-                result.external_product_id,
-                candidate.anchor_text,
-                list_page_url,
-                context.input_category_url,
-                context.target_category_url,
-                context.category_path,
-                context.category_leaf,
-                page_result.status_code,
+            records.append(
+                SeedDetailUrl(
+                    seed_run_id=seed_run_id,
+                    shop_base_url=get_shop_base_url(canonical_url),
+                    platform_hint=result.platform_hint,
+                    category_url=context.input_category_url,
+                    category_target_url=context.target_category_url,
+                    category_path=context.category_path,
+                    category_leaf=context.category_leaf,
+                    list_page_url=list_page_url,
+                    discovered_at=_now_iso(),
+                    detail_url=candidate.url,
+                    canonical_url=canonical_url,
+                    external_product_id=result.external_product_id,
+                    anchor_text=candidate.anchor_text,
+                    http_status=page_result.status_code,
+                    notes=[],
+                )
             )
+        await record_details(records)
         return page_new
 
     async def crawl_page_param(
         context: CategoryContext,
         category_seen: set,
+        category_raw_seen: set,
         start_page: int,
         pages_fetched: int = 0,
     ) -> None:
@@ -325,6 +333,7 @@ async def collect(args: argparse.Namespace) -> None:
                 context,
                 list_page_url,
                 category_seen,
+                category_raw_seen,
             )
             if page_new == 0:
                 break
@@ -333,18 +342,22 @@ async def collect(args: argparse.Namespace) -> None:
     async def crawl_next_link(
         context: CategoryContext,
         category_seen: set,
+        category_raw_seen: set,
         start_url: Optional[str] = None,
         pages_fetched: int = 0,
     ) -> None:
         list_page_url = start_url or context.target_category_url
-        visited = set()
+        visited: "OrderedDict[str, None]" = OrderedDict()
+        visited_cap = max_pages or MAX_VISITED_PAGES
 
         while list_page_url and not stop_event.is_set():
             if list_page_url in visited:
                 break
             if max_pages is not None and pages_fetched >= max_pages:
                 break
-            visited.add(list_page_url)
+            visited[list_page_url] = None
+            if len(visited) > visited_cap:
+                visited.popitem(last=False)
 
             page_result = await fetch_page(
                 context.input_category_url,
@@ -360,13 +373,18 @@ async def collect(args: argparse.Namespace) -> None:
                 context,
                 list_page_url,
                 category_seen,
+                category_raw_seen,
             )
             if page_new == 0:
                 break
 
             list_page_url = page_result.next_link
 
-    async def crawl_auto(context: CategoryContext, category_seen: set) -> None:
+    async def crawl_auto(
+        context: CategoryContext,
+        category_seen: set,
+        category_raw_seen: set,
+    ) -> None:
         first_url = build_page_url(context.target_category_url, args.page_param, args.start_page)
         page_result = await fetch_page(
             context.input_category_url,
@@ -382,12 +400,14 @@ async def collect(args: argparse.Namespace) -> None:
             context,
             first_url,
             category_seen,
+            category_raw_seen,
         )
 
         if page_new == 0 and page_result.next_link:
             await crawl_next_link(
                 context,
                 category_seen,
+                category_raw_seen,
                 start_url=page_result.next_link,
                 pages_fetched=pages_fetched,
             )
@@ -399,11 +419,12 @@ async def collect(args: argparse.Namespace) -> None:
         await crawl_page_param(
             context,
             category_seen,
+            category_raw_seen,
             args.start_page + 1,
             pages_fetched=pages_fetched,
         )
 
-    async def fetch_soup(url: str) -> Optional[BeautifulSoup]:
+    async def fetch_tree(url: str) -> Optional[HtmlElement]:
         try:
             response = await fetcher.fetch(url)
         except FetchError:
@@ -411,7 +432,7 @@ async def collect(args: argparse.Namespace) -> None:
         if response.status_code >= 400:
             return None
         try:
-            return BeautifulSoup(response.text, "html.parser")
+            return parse_html(response.text)
         except Exception:
             return None
 
@@ -439,7 +460,7 @@ async def collect(args: argparse.Namespace) -> None:
         return path
 
     def _get_query_value(url: str, key: str) -> Optional[str]:
-        parsed = urlparse(url)
+        parsed = cached_urlparse(url)
         for k, value in parse_qsl(parsed.query, keep_blank_values=True):
             if k == key:
                 return value
@@ -451,13 +472,12 @@ async def collect(args: argparse.Namespace) -> None:
         else:
             discovery_url = input_category_url
 
-        soup = await fetch_soup(discovery_url)
-        if soup is None:
+        tree = await fetch_tree(discovery_url)
+        if tree is None:
             return [CategoryContext(input_category_url, input_category_url, [], None)]
 
-        breadcrumbs = extract_breadcrumbs(soup)
-        active_label = detect_active_subcategory_label(soup, discovery_url)
-        subcategories = extract_subcategory_links(soup, discovery_url)
+        breadcrumbs = extract_breadcrumbs(tree)
+        subcategories, active_label = extract_category_info(tree, discovery_url)
 
         if args.subcategory_mode == "off":
             path = _build_category_path(breadcrumbs, active_label)
@@ -507,7 +527,7 @@ async def collect(args: argparse.Namespace) -> None:
         if stop_event.is_set():
             return
 
-        allowed, robots_error = await check_robots(
+        allowed, robots_error = await robots_cache.check(
             fetcher,
             context.target_category_url,
             DEFAULT_USER_AGENT,
@@ -530,13 +550,14 @@ async def collect(args: argparse.Namespace) -> None:
             )
 
         category_seen: set = set()
+        category_raw_seen: set = set()
 
         if args.paging_mode == "page_param":
-            await crawl_page_param(context, category_seen, args.start_page)
+            await crawl_page_param(context, category_seen, category_raw_seen, args.start_page)
         elif args.paging_mode == "next_link":
-            await crawl_next_link(context, category_seen)
+            await crawl_next_link(context, category_seen, category_raw_seen)
         else:
-            await crawl_auto(context, category_seen)
+            await crawl_auto(context, category_seen, category_raw_seen)
 
     try:
         async with Fetcher(
@@ -546,6 +567,8 @@ async def collect(args: argparse.Namespace) -> None:
             retry_count=args.retry_count,
             user_agent=DEFAULT_USER_AGENT,
         ) as fetcher:
+            await robots_cache.warm(fetcher, args.category_url)
+
             contexts: List[CategoryContext] = []
             for url in args.category_url:
                 contexts.extend(await discover_category_targets(url))
@@ -571,13 +594,28 @@ async def collect(args: argparse.Namespace) -> None:
             },
         )
 
-        with manifest_path.open("w", encoding="utf-8") as fp:
-            json.dump(manifest.model_dump(), fp, indent=2, ensure_ascii=True)
-            fp.write("\n")
+        manifest_path.write_bytes(msgspec.json.format(msgspec.json.encode(manifest), indent=2) + b"\n")
     finally:
         detail_writer.close()
         failure_writer.close()
 
 
+def _parse_page(
+    text: str,
+    list_page_url: str,
+    platform_hint: str,
+    use_fast_path: bool = False,
+) -> Tuple[List[LinkCandidate], Optional[str]]:
+    if use_fast_path:
+        candidates = fast_extract_product_links(text, list_page_url, platform_hint)
+        if candidates:
+            return candidates, None
+
+    tree = parse_html(text)
+    candidates = extract_product_links_from_tree(tree, list_page_url, platform_hint)
+    next_link = extract_next_link_from_tree(tree, list_page_url)
+    return candidates, next_link
+
+
 def _now_iso() -> str:
     return datetime.now(timezone.utc).isoformat()
@@ -1,15 +1,18 @@
 import re
+import threading
 from dataclasses import dataclass
+from html import unescape
 from typing import List, Optional
-from urllib.parse import urljoin, urlparse
+from urllib.parse import urljoin
 
-from bs4 import BeautifulSoup
+import lxml.html
+from lxml import etree
+from lxml.html import HtmlElement
+
+from .normalize_url import cached_urlparse
 
 
-CAFE24_DETAIL_RE = re.compile(r"/product/detail\.html", re.IGNORECASE)
 CAFE24_PRODUCT_NO_RE = re.compile(r"(?:^|&|\?)product_no=\d+", re.IGNORECASE)
-SHOPIFY_PRODUCT_RE = re.compile(r"/products/[^/?#]+", re.IGNORECASE)
-CUSTOM_PHP_RE = re.compile(r"/detail\.php", re.IGNORECASE)
 CUSTOM_PHP_ID_RE = re.compile(r"(?:^|&|\?)(pno|goodsno|product_no)=[^&]+", re.IGNORECASE)
 GENERIC_PRODUCT_RE = re.compile(r"/product/([^/?#]+)", re.IGNORECASE)
 GENERIC_EXCLUDE_RE = re.compile(
@@ -27,13 +30,59 @@ GENERIC_PATH_EXCLUDE = (
     "/product/brand",
 )
 
-CAFE24_LIST_SELECTORS = (
-    ".xans-product-listnormal",
-    ".xans-product-normalpackage",
-    ".xans-product-listcategory",
+GENERIC_PATH_EXCLUDE_RE = re.compile("|".join(map(re.escape, GENERIC_PATH_EXCLUDE)), re.IGNORECASE)
+
+# One pass over the path records which platform markers are present. Each
+# match consumes only the leading "/" so markers never hide one another.
+PRODUCT_PATH_RE = re.compile(
+    r"/(?:(?=(?P<cafe24>product/detail\.html))"
+    r"|(?=(?P<shopify>products/[^/?#]))"
+    r"|(?=(?P<custom_php>detail\.php))"
+    r"|(?=(?P<generic>product/)))",
+    re.IGNORECASE,
+)
+SKIP_HREF_RE = re.compile(r"#|javascript:|mailto:|tel:", re.IGNORECASE)
+# Hrefs that urljoin would rewrite or reject: dot segments, empty "?" or "#",
+# path params, whitespace/control characters and IPv6 brackets.
+JOIN_FALLBACK_RE = re.compile(r"/\.|[\x00-\x20;\\\[\]]|\?#|[?#]$")
+
+CAFE24_LIST_CLASSES = (
+    "xans-product-listnormal",
+    "xans-product-normalpackage",
+    "xans-product-listcategory",
 )
 CAFE24_EXCLUDE_ANCESTOR_HINTS = ("menu-ranking", "listmain", "swiper")
 
+FAST_PATH_PLATFORMS = ("shopify", "custom_php")
+# Matches <a href> values in raw HTML. Comments and raw-text elements are
+# consumed by the first alternatives so anchors inside them are never seen,
+# matching what the parser would put in the tree.
+ANCHOR_HREF_RE = re.compile(
+    r"<!--.*?(?:-->|$)"
+    r"|<(script|style|textarea|title)\b.*?(?:</\1\s*>|$)"
+    r"""|<a\b(?:[^>"']|"[^"]*"|'[^']*')*?\shref\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'<>`]+))""",
+    re.IGNORECASE | re.DOTALL,
+)
+
+
+_UPPER = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+_LOWER = "abcdefghijklmnopqrstuvwxyz"
+
+_EXCLUDED_ANCESTOR = " or ".join(
+    f"contains(translate(@class, '{_UPPER}', '{_LOWER}'), '{hint}')" for hint in CAFE24_EXCLUDE_ANCESTOR_HINTS
+)
+_CAFE24_ROOTS_XPATH = etree.XPath(
+    "//*[{}]".format(
+        " or ".join(
+            [f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')" for name in CAFE24_LIST_CLASSES]
+            + [f"contains(@class, 'prdList') and not(ancestor-or-self::*[{_EXCLUDED_ANCESTOR}])"]
+        )
+    )
+)
+_ROOT_ANCHORS_XPATH = etree.XPath("$roots/descendant::a[@href]")
+# parse_html runs in worker threads and lxml locks a parser for the whole parse.
+_THREAD_PARSERS = threading.local()
+
 
 @dataclass(frozen=True)
 class LinkCandidate:
@@ -41,30 +90,73 @@ class LinkCandidate:
     anchor_text: Optional[str]
 
 
+def parse_html(html: str) -> HtmlElement:
+    try:
+        try:
+            return lxml.html.document_fromstring(html, parser=_get_parser(None))
+        except ValueError:
+            return lxml.html.document_fromstring(html.encode("utf-8"), parser=_get_parser("utf-8"))
+    except etree.ParserError:
+        return lxml.html.document_fromstring("<html></html>", parser=_get_parser(None))
+
+
+def _get_parser(encoding: Optional[str]) -> lxml.html.HTMLParser:
+    name = f"parser_{encoding}"
+    parser = getattr(_THREAD_PARSERS, name, None)
+    if parser is None:
+        parser = lxml.html.HTMLParser(encoding=encoding, collect_ids=False)
+        setattr(_THREAD_PARSERS, name, parser)
+    return parser
+
+
 def extract_product_links(html: str, base_url: str, platform_hint: str) -> List[LinkCandidate]:
-    soup = BeautifulSoup(html, "html.parser")
-    return extract_product_links_from_soup(soup, base_url, platform_hint)
+    tree = parse_html(html)
+    return extract_product_links_from_tree(tree, base_url, platform_hint)
 
 
-def extract_product_links_from_soup(
-    soup: BeautifulSoup,
+def extract_product_links_from_tree(
+    tree: HtmlElement,
     base_url: str,
     platform_hint: str,
 ) -> List[LinkCandidate]:
-    roots = _select_anchor_roots(soup, platform_hint)
+    roots = _select_anchor_roots(tree, platform_hint)
     return _extract_links_from_roots(roots, base_url, platform_hint)
 
 
+def fast_extract_product_links(html: str, base_url: str, platform_hint: str) -> List[LinkCandidate]:
+    seen = set()
+    candidates: List[LinkCandidate] = []
+
+    for match in ANCHOR_HREF_RE.finditer(html):
+        raw_href = match.group(2) or match.group(3) or match.group(4)
+        if not raw_href:
+            continue
+        href = unescape(raw_href).strip()
+        if not href or _is_skippable_href(href):
+            continue
+
+        absolute = _join_url(base_url, href)
+        if absolute in seen:
+            continue
+        seen.add(absolute)
+
+        if not _is_allowed_platform(classify_product_url(absolute), platform_hint):
+            continue
+        candidates.append(LinkCandidate(url=absolute, anchor_text=None))
+
+    return candidates
+
+
 def extract_next_link(html: str, base_url: str) -> Optional[str]:
-    soup = BeautifulSoup(html, "html.parser")
-    return extract_next_link_from_soup(soup, base_url)
+    tree = parse_html(html)
+    return extract_next_link_from_tree(tree, base_url)
 
 
-def extract_next_link_from_soup(soup: BeautifulSoup, base_url: str) -> Optional[str]:
+def extract_next_link_from_tree(tree: HtmlElement, base_url: str) -> Optional[str]:
     next_words = {"next", "\ub2e4\uc74c"}
     next_symbols = {">", ">>", "\u203a", "\u00bb"}
 
-    for anchor in soup.find_all("a", href=True):
+    for anchor in tree.iter("a"):
         href = anchor.get("href")
         if not href:
             continue
@@ -72,102 +164,95 @@ def extract_next_link_from_soup(soup: BeautifulSoup, base_url: str) -> Optional[
         if _is_skippable_href(href):
             continue
 
-        rel = [value.lower() for value in anchor.get("rel", [])]
+        rel = (anchor.get("rel") or "").lower().split()
         if "next" in rel:
-            return urljoin(base_url, href)
+            return _join_url(base_url, href)
 
-        text = anchor.get_text(" ", strip=True).lower()
+        text = _anchor_text(anchor).lower()
         aria = (anchor.get("aria-label") or "").lower()
         combined = f"{text} {aria}".strip()
 
         if any(word in combined for word in next_words):
-            return urljoin(base_url, href)
+            return _join_url(base_url, href)
         if combined in next_symbols:
-            return urljoin(base_url, href)
+            return _join_url(base_url, href)
 
     return None
 
 
-def _select_anchor_roots(soup: BeautifulSoup, platform_hint: str) -> List[BeautifulSoup]:
+def _select_anchor_roots(tree: HtmlElement, platform_hint: str) -> List[HtmlElement]:
     if platform_hint in ("cafe24", "auto"):
-        roots = _find_cafe24_list_roots(soup)
+        roots = _find_cafe24_list_roots(tree)
         if roots:
             return roots
-    return [soup]
+    return [tree]
 
 
-def _find_cafe24_list_roots(soup: BeautifulSoup) -> List[BeautifulSoup]:
-    roots: List[BeautifulSoup] = []
-    for selector in CAFE24_LIST_SELECTORS:
-        roots.extend(soup.select(selector))
-    if roots:
-        return roots
-
-    for node in soup.find_all(class_=lambda v: v and "prdList" in v):
-        if _has_ancestor_class(node, CAFE24_EXCLUDE_ANCESTOR_HINTS):
-            continue
-        roots.append(node)
-    return roots
-
-
-def _has_ancestor_class(node: BeautifulSoup, hints: tuple) -> bool:
-    current = node
-    while current is not None:
-        classes = current.get("class", [])
-        if classes:
-            joined = " ".join(classes).lower()
-            if any(hint in joined for hint in hints):
-                return True
-        current = current.parent
-        if not hasattr(current, "get"):
-            break
-    return False
+def _find_cafe24_list_roots(tree: HtmlElement) -> List[HtmlElement]:
+    roots: List[HtmlElement] = []
+    prd_lists: List[HtmlElement] = []
+    for node in _CAFE24_ROOTS_XPATH(tree):
+        classes = node.get("class").split()
+        if any(name in classes for name in CAFE24_LIST_CLASSES):
+            roots.append(node)
+        elif not roots:
+            prd_lists.append(node)
+    return roots or prd_lists
 
 
 def _extract_links_from_roots(
-    roots: List[BeautifulSoup],
+    roots: List[HtmlElement],
     base_url: str,
     platform_hint: str,
 ) -> List[LinkCandidate]:
-    seen = set()
+    seen: set = set()
     candidates: List[LinkCandidate] = []
 
-    for root in roots:
-        for anchor in root.find_all("a", href=True):
-            href = anchor.get("href")
-            if not href:
-                continue
-            href = href.strip()
-            if _is_skippable_href(href):
-                continue
+    if not roots:
+        return candidates
+
+    for anchor in _ROOT_ANCHORS_XPATH(roots[0], roots=roots):
+        href = anchor.get("href").strip()
+        if not href or _is_skippable_href(href):
+            continue
 
-            absolute = urljoin(base_url, href)
-            matched_platform = classify_product_url(absolute)
-            if not _is_allowed_platform(matched_platform, platform_hint):
-                continue
+        absolute: str = _join_url(base_url, href)
+        if absolute in seen:
+            continue
+        seen.add(absolute)
 
-            if absolute in seen:
-                continue
-            seen.add(absolute)
+        matched_platform = classify_product_url(absolute)
+        if not _is_allowed_platform(matched_platform, platform_hint):
+            continue
 
-            text = anchor.get_text(" ", strip=True) or None
-            candidates.append(LinkCandidate(url=absolute, anchor_text=text))
+        text = _anchor_text(anchor) or None
+        candidates.append(LinkCandidate(url=absolute, anchor_text=text))
 
     return candidates
 
 
+def _anchor_text(anchor: HtmlElement) -> str:
+    parts = (part.strip() for part in anchor.itertext())
+    return " ".join(part for part in parts if part)
+
+
 def classify_product_url(url: str) -> Optional[str]:
-    parsed = urlparse(url)
-    path = parsed.path or ""
-    query = parsed.query or ""
+    parsed = cached_urlparse(url)
+    return classify_product_parts(parsed.path, parsed.query)
+
 
-    if CAFE24_DETAIL_RE.search(path) and CAFE24_PRODUCT_NO_RE.search(query):
+def classify_product_parts(path: str, query: str) -> Optional[str]:
+    markers = {match.lastgroup for match in PRODUCT_PATH_RE.finditer(path)}
+    if not markers:
+        return None
+
+    if "cafe24" in markers and CAFE24_PRODUCT_NO_RE.search(query):
         return "cafe24"
-    if SHOPIFY_PRODUCT_RE.search(path):
+    if "shopify" in markers:
         return "shopify"
-    if CUSTOM_PHP_RE.search(path) and CUSTOM_PHP_ID_RE.search(query):
+    if "custom_php" in markers and CUSTOM_PHP_ID_RE.search(query):
         return "custom_php"
-    if _is_generic_product_detail(path):
+    if ("generic" in markers or "cafe24" in markers) and _is_generic_product_detail(path):
         return "unknown"
     return None
 
@@ -188,13 +273,12 @@ def _is_generic_product_detail(path: str) -> bool:
     match = GENERIC_PRODUCT_RE.search(path or "")
     if not match:
         return False
-    path_lower = (path or "").lower()
-    if any(fragment in path_lower for fragment in GENERIC_PATH_EXCLUDE):
+    if GENERIC_PATH_EXCLUDE_RE.search(path or ""):
         return False
     slug = match.group(1)
     if not slug:
         return False
-    slug_lower = slug.lower()
+    slug_lower: str = slug.lower()
     if slug_lower in {"detail", "detail.html"}:
         return False
     if slug_lower.endswith((".jpg", ".jpeg", ".png", ".gif", ".webp")):
@@ -204,6 +288,23 @@ def _is_generic_product_detail(path: str) -> bool:
     return True
 
 
+def _join_url(base_url: str, href: str) -> str:
+    if JOIN_FALLBACK_RE.search(href) is None:
+        if href.startswith(("http://", "https://")):
+            if _has_plain_host(href, href.index("//") + 2):
+                return href
+        elif href.startswith("//"):
+            if _has_plain_host(href, 2):
+                return f"{cached_urlparse(base_url).scheme}:{href}"
+        elif href.startswith("/"):
+            base = cached_urlparse(base_url)
+            return f"{base.scheme}://{base.netloc}{href}"
+    return urljoin(base_url, href)
+
+
+def _has_plain_host(href: str, start: int) -> bool:
+    return href.isascii() and len(href) > start and href[start] not in "/?#"
+
+
 def _is_skippable_href(href: str) -> bool:
-    lower = href.lower()
-    return lower.startswith("#") or lower.startswith("javascript:") or lower.startswith("mailto:") or lower.startswith("tel:")
+    return SKIP_HREF_RE.match(href) is not None
@@ -1,14 +1,17 @@
 import asyncio
 import random
 from typing import Dict, Optional
-from urllib.parse import urlparse
 
 import httpx
 
+from .normalize_url import cached_urlparse
 from .rate_limit import RateLimiter
 
 
 RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+KEEPALIVE_EXPIRY_SEC = 30.0
+BACKOFF_BASE_SEC = 0.5
+BACKOFF_CAP_SEC = 10.0
 
 
 class FetchError(RuntimeError):
@@ -24,14 +27,21 @@ class Fetcher:
         retry_count: int,
         user_agent: str,
     ) -> None:
-        self._sem = asyncio.Semaphore(max(1, concurrency))
+        self._concurrency = max(1, concurrency)
         self._rate_limit_rps = float(rate_limit_rps)
         self._retry_count = max(0, retry_count)
         self._limiters: Dict[str, RateLimiter] = {}
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._rng = random.Random()
         self._client = httpx.AsyncClient(
             timeout=httpx.Timeout(timeout_sec),
             follow_redirects=True,
             headers={"User-Agent": user_agent},
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=None,
+                keepalive_expiry=KEEPALIVE_EXPIRY_SEC,
+            ),
         )
 
     async def __aenter__(self) -> "Fetcher":
@@ -44,40 +54,47 @@ class Fetcher:
         await self._client.aclose()
 
     async def fetch(self, url: str) -> httpx.Response:
-        limiter = self._get_limiter(url)
+        host = cached_urlparse(url).netloc.lower()
+        limiter = self._get_limiter(host)
+        semaphore = self._get_semaphore(host)
         attempt = 0
+        delay = BACKOFF_BASE_SEC
 
         while True:
-            async with self._sem:
+            async with semaphore:
                 await limiter.acquire()
                 try:
                     response = await self._client.get(url)
                 except httpx.RequestError as exc:
                     if attempt >= self._retry_count:
                         raise FetchError(str(exc)) from exc
-                    await asyncio.sleep(self._backoff_delay(attempt))
+                    delay = self._backoff_delay(delay)
+                    await asyncio.sleep(delay)
                     attempt += 1
                     continue
 
             if response.status_code in RETRY_STATUS_CODES and attempt < self._retry_count:
                 retry_after = self._parse_retry_after(response)
-                await asyncio.sleep(retry_after or self._backoff_delay(attempt))
+                if not retry_after:
+                    delay = self._backoff_delay(delay)
+                await asyncio.sleep(retry_after or delay)
                 attempt += 1
                 continue
 
             return response
 
-    def _get_limiter(self, url: str) -> RateLimiter:
-        host = urlparse(url).netloc.lower()
+    def _get_limiter(self, host: str) -> RateLimiter:
         if host not in self._limiters:
             self._limiters[host] = RateLimiter(self._rate_limit_rps)
         return self._limiters[host]
 
-    @staticmethod
-    def _backoff_delay(attempt: int) -> float:
-        base = 0.5 * (2 ** attempt)
-        jitter = random.uniform(0, 0.25)
-        return min(base + jitter, 10.0)
+    def _get_semaphore(self, host: str) -> asyncio.Semaphore:
+        if host not in self._semaphores:
+            self._semaphores[host] = asyncio.Semaphore(self._concurrency)
+        return self._semaphores[host]
+
+    def _backoff_delay(self, previous: float) -> float:
+        return min(BACKOFF_CAP_SEC, self._rng.uniform(BACKOFF_BASE_SEC, previous * 3))
 
     @staticmethod
     def _parse_retry_after(response: httpx.Response) -> Optional[float]:
@@ -1,17 +1,22 @@
-import json
 from pathlib import Path
 from typing import Any
 
+import msgspec
+
+
+WRITE_BUFFER_SIZE = 1 << 16
+
 
 class JsonlWriter:
     def __init__(self, path: Path) -> None:
         self.path = path
-        self._fp = path.open("w", encoding="utf-8")
+        self._fp = path.open("wb", buffering=WRITE_BUFFER_SIZE)
+        self._encoder = msgspec.json.Encoder()
 
     def write(self, record: Any) -> None:
-        json.dump(record, self._fp, ensure_ascii=True)
-        self._fp.write("\n")
-        self._fp.flush()
+        self._fp.write(self._encoder.encode(record))
+        self._fp.write(b"\n")
 
     def close(self) -> None:
+        self._fp.flush()
         self._fp.close()
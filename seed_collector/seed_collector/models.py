@@ -1,15 +1,15 @@
 from typing import List, Optional
 
-from pydantic import BaseModel, Field
+import msgspec
 
 
-class SeedDetailUrl(BaseModel):
+class SeedDetailUrl(msgspec.Struct, kw_only=True):
     seed_run_id: str
     shop_base_url: str
     platform_hint: str
     category_url: str
     category_target_url: Optional[str] = None
-    category_path: List[str] = Field(default_factory=list)
+    category_path: List[str] = msgspec.field(default_factory=list)
     category_leaf: Optional[str] = None
     list_page_url: str
     discovery_method: str = "category_list"
@@ -19,10 +19,10 @@ class SeedDetailUrl(BaseModel):
     external_product_id: Optional[str]
     anchor_text: Optional[str] = None
     http_status: Optional[int] = None
-    notes: List[str] = Field(default_factory=list)
+    notes: List[str] = msgspec.field(default_factory=list)
 
 
-class SeedFailure(BaseModel):
+class SeedFailure(msgspec.Struct, kw_only=True):
     seed_run_id: str
     category_url: str
     category_target_url: Optional[str] = None
@@ -33,7 +33,7 @@ class SeedFailure(BaseModel):
     created_at: str
 
 
-class SeedManifest(BaseModel):
+class SeedManifest(msgspec.Struct, kw_only=True):
     seed_run_id: str
     started_at: str
     finished_at: str
@@ -1,39 +1,41 @@
-from typing import Iterable, List, Tuple
-from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+from functools import lru_cache
+from typing import List, Tuple
+from urllib.parse import ParseResult, urlparse, urlunparse
 
 
 UTM_PREFIX = "utm_"
 
 
+@lru_cache(maxsize=16384)
+def cached_urlparse(url: str) -> ParseResult:
+    return urlparse(url)
+
+
 def get_shop_base_url(url: str) -> str:
-    parsed = urlparse(url)
+    parsed = cached_urlparse(url)
     return f"{parsed.scheme}://{parsed.netloc}"
 
 
 def normalize_unknown_url(url: str) -> str:
-    parsed = urlparse(url)
-    query_pairs = parse_qsl(parsed.query, keep_blank_values=True)
-    filtered = _remove_utm_params(query_pairs)
-    sorted_pairs = sorted(filtered, key=lambda item: (item[0], item[1]))
-    new_query = urlencode(sorted_pairs, doseq=True)
-    normalized = parsed._replace(query=new_query, fragment="")
+    parsed = cached_urlparse(url)
+    pairs = [pair for pair in _split_query(parsed.query) if not pair.lower().startswith(UTM_PREFIX)]
+    pairs.sort(key=_pair_sort_key)
+    normalized = parsed._replace(query="&".join(pairs), fragment="")
     return urlunparse(normalized)
 
 
 def build_page_url(url: str, page_param: str, page_number: int) -> str:
-    parsed = urlparse(url)
-    query_pairs = parse_qsl(parsed.query, keep_blank_values=True)
-    filtered = [(k, v) for k, v in query_pairs if k != page_param]
-    filtered.append((page_param, str(page_number)))
-    new_query = urlencode(filtered, doseq=True)
-    updated = parsed._replace(query=new_query, fragment="")
+    parsed = cached_urlparse(url)
+    pairs = [pair for pair in _split_query(parsed.query) if pair.partition("=")[0] != page_param]
+    pairs.append(f"{page_param}={page_number}")
+    updated = parsed._replace(query="&".join(pairs), fragment="")
     return urlunparse(updated)
 
 
-def _remove_utm_params(query_pairs: Iterable[Tuple[str, str]]) -> List[Tuple[str, str]]:
-    cleaned = []
-    for key, value in query_pairs:
-        if key.lower().startswith(UTM_PREFIX):
-            continue
-        cleaned.append((key, value))
-    return cleaned
+def _split_query(query: str) -> List[str]:
+    return [pair for pair in query.split("&") if pair]
+
+
+def _pair_sort_key(pair: str) -> Tuple[str, str]:
+    key, _, value = pair.partition("=")
+    return key, value
@@ -1,25 +1,72 @@
-from typing import Optional, Tuple
+import asyncio
+from functools import partial
+from typing import Dict, Iterable, Optional, Tuple
 from urllib.parse import urlparse
 from urllib.robotparser import RobotFileParser
 
 from .fetcher import Fetcher, FetchError
 
 
-async def check_robots(fetcher: Fetcher, url: str, user_agent: str) -> Tuple[bool, Optional[str]]:
+RobotsEntry = Tuple[Optional[RobotFileParser], Optional[str]]
+
+
+class RobotsCache:
+    def __init__(self) -> None:
+        self._entries: Dict[str, RobotsEntry] = {}
+        self._inflight: Dict[str, "asyncio.Future[RobotsEntry]"] = {}
+
+    async def warm(self, fetcher: Fetcher, urls: Iterable[str]) -> None:
+        origins = {_origin(url) for url in urls}
+        origins.discard(None)
+        await asyncio.gather(
+            *(self._load(fetcher, origin) for origin in origins if origin not in self._entries),
+            return_exceptions=True,
+        )
+
+    async def check(self, fetcher: Fetcher, url: str, user_agent: str) -> Tuple[bool, Optional[str]]:
+        origin = _origin(url)
+        if origin is None:
+            return True, None
+
+        entry = self._entries.get(origin)
+        if entry is None:
+            entry = await self._load(fetcher, origin)
+
+        parser, error = entry
+        if parser is None:
+            return True, error
+        return parser.can_fetch(user_agent, url), None
+
+    async def _load(self, fetcher: Fetcher, origin: str) -> RobotsEntry:
+        task = self._inflight.get(origin)
+        if task is None:
+            task = asyncio.ensure_future(_fetch_robots(fetcher, origin))
+            self._inflight[origin] = task
+            task.add_done_callback(partial(self._store, origin))
+        return await asyncio.shield(task)
+
+    def _store(self, origin: str, task: "asyncio.Future[RobotsEntry]") -> None:
+        self._inflight.pop(origin, None)
+        if not task.cancelled() and task.exception() is None:
+            self._entries[origin] = task.result()
+
+
+def _origin(url: str) -> Optional[str]:
     parsed = urlparse(url)
     if not parsed.scheme or not parsed.netloc:
-        return True, None
+        return None
+    return f"{parsed.scheme}://{parsed.netloc}"
+
 
-    robots_url = f"{parsed.scheme}://{parsed.netloc}/robots.txt"
+async def _fetch_robots(fetcher: Fetcher, origin: str) -> RobotsEntry:
     try:
-        response = await fetcher.fetch(robots_url)
+        response = await fetcher.fetch(f"{origin}/robots.txt")
     except FetchError as exc:
-        return True, str(exc)
+        return None, str(exc)
 
     if response.status_code >= 400:
-        return True, None
+        return None, None
 
     parser = RobotFileParser()
-    parser.parse(response.text.splitlines())
-    allowed = parser.can_fetch(user_agent, url)
-    return allowed, None
+    parser.parse(response.content.decode("utf-8-sig", errors="replace").splitlines())
+    return parser, None
@@ -1,4 +1,41 @@
+import os
+
 from setuptools import find_packages, setup
+from setuptools.command.build_ext import build_ext
+from setuptools.errors import CCompilerError, ExecError, PlatformError
+
+
+# Per-anchor classification helpers. When Cython is importable at build time
+# these modules are compiled in pure-Python mode; otherwise (or if compiling
+# fails) the plain .py modules are installed unchanged.
+COMPILED_MODULES = [
+    "seed_collector/category_parser.py",
+    "seed_collector/extract_links.py",
+]
+
+
+class OptionalBuildExt(build_ext):
+    def run(self) -> None:
+        try:
+            super().run()
+        except (CCompilerError, ExecError, PlatformError) as exc:
+            self.warn(f"skipping compiled modules: {exc}")
+
+    def build_extension(self, ext) -> None:
+        try:
+            super().build_extension(ext)
+        except (CCompilerError, ExecError, PlatformError, ValueError) as exc:
+            self.warn(f"skipping compiled module {ext.name}: {exc}")
+
+
+def compiled_extensions() -> list:
+    if os.environ.get("SEED_COLLECTOR_PURE_PYTHON"):
+        return []
+    try:
+        from Cython.Build import cythonize
+    except ImportError:
+        return []
+    return cythonize(COMPILED_MODULES, language_level=3, quiet=True)
 
 
 setup(
@@ -10,10 +47,12 @@ setup(
     author="Prompt Shopping",
     python_requires=">=3.9",
     packages=find_packages(include=["seed_collector", "seed_collector.*"]),
+    ext_modules=compiled_extensions(),
+    cmdclass={"build_ext": OptionalBuildExt},
     install_requires=[
-        "httpx>=0.27.0",
-        "pydantic>=2.6.0",
-        "beautifulsoup4>=4.12.0",
+        "httpx[http2,brotli,zstd]>=0.27.1",
+        "msgspec>=0.18.0",
+        "lxml>=5.0.0",
     ],
     extras_require={
         "test": ["pytest>=8.0.0"],
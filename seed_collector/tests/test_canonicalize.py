@@ -31,3 +31,20 @@ def test_unknown_canonicalization():
     assert result.platform_hint == "unknown"
     assert result.external_product_id is None
     assert result.canonical_url == "https://shop.example.com/product/alpha?a=1&b=2"
+
+
+def test_custom_php_prefers_pno_over_later_keys():
+    url = "https://shop.example.com/shop/detail.php?goodsno=&product_no=7&pno=42"
+    result = canonicalize_url(url, "auto")
+    assert result.platform_hint == "custom_php"
+    assert result.external_product_id == "42"
+    assert result.canonical_url == "https://shop.example.com/shop/detail.php?pno=42"
+
+
+def test_product_ids_are_percent_decoded():
+    cafe24 = canonicalize_url("https://shop.example.com/product/detail.html?product_no=%31%32", "auto")
+    assert cafe24.external_product_id == "12"
+    assert cafe24.canonical_url == "https://shop.example.com/product/detail.html?product_no=12"
+
+    custom = canonicalize_url("https://shop.example.com/shop/detail.php?pno=a+b", "auto")
+    assert custom.external_product_id == "a b"
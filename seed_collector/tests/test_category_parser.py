@@ -0,0 +1,44 @@
+import lxml.html
+
+from seed_collector.category_parser import extract_breadcrumbs, extract_category_info
+
+
+HTML = """
+<html>
+  <body>
+    <div class="xans-layout-location Location">
+      <a href="/">Home</a> &gt;
+      <a href="/product/list.html?cate_no=10">WOMAN</a> &gt;
+      <strong><a href="/product/list.html?cate_no=20">APPAREL</a></strong>
+    </div>
+    <ul id="SubCategory">
+      <li><a href="/product/list.html?cate_no=20#top">All</a></li>
+      <li class="ON"><a href="/product/list.html?cate_no=21">Outer</a></li>
+      <li><a href="/product/list.html?cate_no=22"><span>Top</span></a></li>
+      <li><a href="/product/list.html?cate_no=23">Knit
+          Wear</a></li>
+      <li><a href="/product/detail.html?product_no=5&amp;cate_no=20">Product</a></li>
+      <li><a href="https://other.example.com/product/list.html?cate_no=1">Other</a></li>
+      <li><a href="javascript:void(0)">Skip</a></li>
+    </ul>
+  </body>
+</html>
+"""
+BASE_URL = "https://shop.example.com/product/list.html?cate_no=20"
+
+
+def test_extract_breadcrumbs():
+    tree = lxml.html.document_fromstring(HTML)
+    assert extract_breadcrumbs(tree) == ["WOMAN", "APPAREL"]
+
+
+def test_extract_category_info():
+    tree = lxml.html.document_fromstring(HTML)
+    links, active_label = extract_category_info(tree, BASE_URL)
+    assert [(link.label, link.url) for link in links] == [
+        ("All", "https://shop.example.com/product/list.html?cate_no=20"),
+        ("Outer", "https://shop.example.com/product/list.html?cate_no=21"),
+        ("Top", "https://shop.example.com/product/list.html?cate_no=22"),
+        ("Knit Wear", "https://shop.example.com/product/list.html?cate_no=23"),
+    ]
+    assert active_label == "Outer"
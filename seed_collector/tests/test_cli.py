@@ -0,0 +1,79 @@
+import asyncio
+
+import msgspec
+
+from seed_collector import cli
+
+
+LIST_PAGE = """
+<html><body>
+  <a href="/products/wool-coat"><span>Wool</span> Coat</a>
+  <a href="/products/linen-shirt">Linen Shirt</a>
+</body></html>
+"""
+
+
+class _Response:
+    def __init__(self, status_code, text=""):
+        self.status_code = status_code
+        self.text = text
+        self.content = text.encode("utf-8")
+
+
+class _StubFetcher:
+    def __init__(self, **kwargs):
+        pass
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return None
+
+    async def fetch(self, url):
+        if url.endswith("/robots.txt"):
+            return _Response(404)
+        if url.endswith("page=1"):
+            return _Response(200, LIST_PAGE)
+        return _Response(200, "<html><body></body></html>")
+
+
+def _collect(monkeypatch, tmp_path, *extra):
+    monkeypatch.setattr(cli, "Fetcher", _StubFetcher)
+    args = cli.build_parser().parse_args(
+        [
+            "collect",
+            "--category-url",
+            "https://shop.example.com/collections/all",
+            "--out-dir",
+            str(tmp_path),
+            "--paging-mode",
+            "page_param",
+            "--platform-hint",
+            "shopify",
+            "--subcategory-mode",
+            "off",
+            *extra,
+        ]
+    )
+    asyncio.run(cli.collect(args))
+    lines = (tmp_path / "detail_urls.jsonl").read_bytes().splitlines()
+    return [msgspec.json.decode(line) for line in lines]
+
+
+def test_page_param_run_keeps_anchor_text_by_default(monkeypatch, tmp_path):
+    records = _collect(monkeypatch, tmp_path)
+
+    assert [(r["canonical_url"], r["anchor_text"]) for r in records] == [
+        ("https://shop.example.com/products/wool-coat", "Wool Coat"),
+        ("https://shop.example.com/products/linen-shirt", "Linen Shirt"),
+    ]
+
+
+def test_fast_extract_is_opt_in(monkeypatch, tmp_path):
+    records = _collect(monkeypatch, tmp_path, "--fast-extract")
+
+    assert [(r["canonical_url"], r["anchor_text"]) for r in records] == [
+        ("https://shop.example.com/products/wool-coat", None),
+        ("https://shop.example.com/products/linen-shirt", None),
+    ]
@@ -1,4 +1,11 @@
-from seed_collector.extract_links import extract_next_link, extract_product_links
+from urllib.parse import urljoin
+
+from seed_collector.extract_links import (
+    _join_url,
+    extract_next_link,
+    extract_product_links,
+    fast_extract_product_links,
+)
 
 
 def test_extract_product_links_dedupes_and_absolutizes():
@@ -26,6 +33,18 @@ def test_extract_product_links_dedupes_and_absolutizes():
     assert len(urls) == 4
 
 
+def test_extract_product_links_keeps_text_around_comments():
+    html = '<html><body><a href="/products/coat">Wool<!-- badge -->Coat</a></body></html>'
+    links = extract_product_links(html, "https://shop.example.com/", "shopify")
+    assert [link.anchor_text for link in links] == ["Wool Coat"]
+
+
+def test_extract_product_links_handles_empty_documents():
+    for html in ("", "   ", '<?xml version="1.0" encoding="utf-8"?>'):
+        assert extract_product_links(html, "https://shop.example.com/", "auto") == []
+        assert extract_next_link(html, "https://shop.example.com/") is None
+
+
 def test_extract_next_link():
     html = """
     <html>
@@ -63,3 +82,82 @@ def test_cafe24_scopes_to_normal_list():
 
     assert "https://shop.example.com/product/detail.html?product_no=2&cate_no=3490" in urls
     assert "https://shop.example.com/product/detail.html?product_no=1&cate_no=1" not in urls
+
+
+def test_cafe24_root_anchor_itself_is_not_a_link():
+    html = """
+    <html>
+      <body>
+        <a class="xans-product-listnormal" href="/product/detail.html?product_no=9">
+          <span><a href="/product/detail.html?product_no=2">Main</a></span>
+        </a>
+      </body>
+    </html>
+    """
+    links = extract_product_links(html, "https://shop.example.com/product/list.html", "cafe24")
+    assert [link.url for link in links] == ["https://shop.example.com/product/detail.html?product_no=2"]
+
+
+def test_fast_extract_product_links_matches_platform():
+    html = """
+    <html>
+      <body>
+        <a class="card" href="/products/hat?variant=1&amp;ref=list">Hat</a>
+        <a href='https://shop.example.com/products/hat?variant=1&amp;ref=list'>Again</a>
+        <a href="/products/shirt">Shirt</a>
+        <a href="/detail.php?pno=555">Custom</a>
+        <a href="/collections/all">All</a>
+      </body>
+    </html>
+    """
+    base_url = "https://shop.example.com/collections/all?page=1"
+    links = fast_extract_product_links(html, base_url, "shopify")
+    urls = [link.url for link in links]
+
+    assert urls == [
+        "https://shop.example.com/products/hat?variant=1&ref=list",
+        "https://shop.example.com/products/shirt",
+    ]
+
+
+def test_fast_extract_product_links_matches_tree_path():
+    html = """
+    <html>
+      <head>
+        <link rel="preload" href="/products/hero.jpg">
+        <script>var card = '<a href="/products/template-x">';</script>
+      </head>
+      <body>
+        <!-- <a href="/products/discontinued">Old</a> -->
+        <a data-href="/products/ghost" href="/products/hat">Hat</a>
+        <a href=/products/scarf>Scarf</a>
+        <a href="/product/alpha">Generic</a>
+        <a href="/detail.php?pno=555">Custom</a>
+        <a href="/products/hat">Again</a>
+      </body>
+    </html>
+    """
+    base_url = "https://shop.example.com/collections/all?page=1"
+    fast_urls = [link.url for link in fast_extract_product_links(html, base_url, "shopify")]
+    tree_urls = [link.url for link in extract_product_links(html, base_url, "shopify")]
+
+    assert fast_urls == tree_urls == [
+        "https://shop.example.com/products/hat",
+        "https://shop.example.com/products/scarf",
+        "https://shop.example.com/product/alpha",
+    ]
+
+
+def test_join_url_matches_urljoin():
+    base_url = "https://shop.example.com/product/list.html?cate_no=10"
+    hrefs = [
+        "/product/detail.html?product_no=1",
+        "//cdn.example.com/products/alpha",
+        "https://shop.example.com/products/alpha",
+        "detail.html?product_no=2",
+        "/product/../products/beta",
+        "/product/detail.html?",
+        "//",
+    ]
+    for href in hrefs:
+        assert _join_url(base_url, href) == urljoin(base_url, href)
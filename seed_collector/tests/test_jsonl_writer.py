@@ -0,0 +1,19 @@
+import msgspec
+
+from seed_collector.jsonl_writer import JsonlWriter
+
+
+def test_jsonl_writer_writes_utf8_lines(tmp_path):
+    path = tmp_path / "out.jsonl"
+    writer = JsonlWriter(path)
+    writer.write({"anchor_text": "니트 웨어", "notes": []})
+    writer.write({"anchor_text": None, "notes": ["a"]})
+    writer.close()
+
+    raw = path.read_bytes()
+    assert "니트 웨어".encode("utf-8") in raw
+    lines = raw.splitlines()
+    assert [msgspec.json.decode(line) for line in lines] == [
+        {"anchor_text": "니트 웨어", "notes": []},
+        {"anchor_text": None, "notes": ["a"]},
+    ]
@@ -11,3 +11,9 @@ def test_build_page_url_replaces_param():
     url = "https://shop.example.com/list?cate_no=10&page=2"
     updated = build_page_url(url, "page", 5)
     assert updated == "https://shop.example.com/list?cate_no=10&page=5"
+
+
+def test_normalize_unknown_url_keeps_query_encoding():
+    url = "https://shop.example.com/product/alpha?q=a%20b&UTM_medium=x&flag&b=1"
+    normalized = normalize_unknown_url(url)
+    assert normalized == "https://shop.example.com/product/alpha?b=1&flag&q=a%20b"
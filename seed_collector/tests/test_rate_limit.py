@@ -0,0 +1,39 @@
+import asyncio
+import time
+
+from seed_collector.rate_limit import RateLimiter
+
+
+def test_rate_limiter_spaces_concurrent_callers():
+    limiter = RateLimiter(20.0)
+    finished = []
+
+    async def call():
+        await limiter.acquire()
+        finished.append(time.monotonic())
+
+    async def run():
+        await asyncio.gather(*(call() for _ in range(5)))
+
+    started = time.monotonic()
+    asyncio.run(run())
+    offsets = [moment - started for moment in finished]
+    assert all(offset >= index * 0.05 - 0.01 for index, offset in enumerate(offsets))
+    assert offsets[-1] < 1.0
+
+
+def test_rate_limiter_cancelled_waiter_releases_its_slot():
+    limiter = RateLimiter(10.0)
+
+    async def run():
+        await limiter.acquire()
+        started = time.monotonic()
+        waiter = asyncio.ensure_future(limiter.acquire())
+        await asyncio.sleep(0.02)
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+        await limiter.acquire()
+        return time.monotonic() - started
+
+    elapsed = asyncio.run(run())
+    assert 0.07 <= elapsed < 0.15
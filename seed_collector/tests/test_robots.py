@@ -0,0 +1,62 @@
+import asyncio
+
+from seed_collector.robots import RobotsCache
+
+
+class _Response:
+    status_code = 200
+    content = b"\xef\xbb\xbfUser-agent: *\nDisallow: /private\n"
+
+
+class _CountingFetcher:
+    def __init__(self) -> None:
+        self.calls = []
+
+    async def fetch(self, url):
+        self.calls.append(url)
+        await asyncio.sleep(0)
+        return _Response()
+
+
+def test_robots_cache_fetches_each_origin_once():
+    fetcher = _CountingFetcher()
+    cache = RobotsCache()
+
+    async def run():
+        return await asyncio.gather(
+            cache.check(fetcher, "https://a.example.com/list", "bot"),
+            cache.check(fetcher, "https://a.example.com/private/x", "bot"),
+            cache.check(fetcher, "https://b.example.com/list", "bot"),
+            cache.check(fetcher, "https://a.example.com/other", "bot"),
+        )
+
+    results = asyncio.run(run())
+    assert [allowed for allowed, _ in results] == [True, False, True, True]
+    assert sorted(fetcher.calls) == [
+        "https://a.example.com/robots.txt",
+        "https://b.example.com/robots.txt",
+    ]
+
+
+def test_robots_cache_warm_prefetches_unique_origins():
+    fetcher = _CountingFetcher()
+    cache = RobotsCache()
+
+    async def run():
+        await cache.warm(
+            fetcher,
+            [
+                "https://a.example.com/list?cate_no=1",
+                "https://a.example.com/list?cate_no=2",
+                "https://b.example.com/list",
+                "not-a-url",
+            ],
+        )
+        return await cache.check(fetcher, "https://a.example.com/private/x", "bot")
+
+    allowed, error = asyncio.run(run())
+    assert (allowed, error) == (False, None)
+    assert sorted(fetcher.calls) == [
+        "https://a.example.com/robots.txt",
+        "https://b.example.com/robots.txt",
+    ]